@@ -1,16 +1,44 @@
-import json
-import xml.etree.ElementTree as ET
-from pdf_parser import extract_xml_from_xfa, xml_get_text
+import logging
+import re
+import string
+from lxml import etree
+from pdf_parser import (
+    XFA_NAMESPACES,
+    extract_xml_from_xfa,
+    xpath_get_text,
+)
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Optional, Tuple, Union
 from pypdf._reader import StrByteType
-from enum import Enum
+from enum import IntEnum
 from pprint import pformat
 
-_NAMESPACES = {"xfa": "http://www.xfa.org/schema/xfa-data/1.0/"}
+logger = logging.getLogger(__name__)
 
+# group 1: everything from the first to the last digit, group 2: the abbreviation at the end (if any)
+_MONEY_RE = re.compile(r"(\d(?:.*\d)?)\D*?(mm|k|m|b|t)?\Z", re.DOTALL)
+# lowercases (ASCII only, the abbreviations are ASCII) and drops commas in a single pass
+_MONEY_TABLE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase, ",")
+_MONEY_FACTORS = {
+    None: 1,
+    "k": 1_000,
+    "m": 1_000_000,
+    "mm": 1_000_000,
+    "b": 1_000_000_000,
+    "t": 1_000_000_000_000,
+}
 
-class SecurityType(str, Enum):
+# drops the thousands separators from security amounts, e.g. "1,000" -> "1000"
+_COMMA_STRIP = str.maketrans("", "", ",")
+
+_ISSUER_TYPES = {
+    "1": "Company/Corporation",
+    "2": "Registered/Recognised Business Trust",
+    "3": "Real Estate Investment Trust",
+}
+
+
+class SecurityType(IntEnum):
     ORDINARY_SHARES = 1
     OTHER_SHARES = 2
     RIGHTS_OPTIONS_WARRANTS = 3
@@ -51,42 +79,20 @@ def money_str_to_float(text: str, default: Optional[float] = None) -> float | No
     ------
     Takes abbreviations up to "t" for trillion
     """
-    text = text.lower().replace(",", "")
-    output = ""
-    idx_start = -1
-    idx_end = -1
-
-    for i in range(len(text)):
-        if text[i].isdecimal():
-            idx_start = i
-            break
-
-    for i in range(len(text)-1, -1, -1):
-        if text[i].isdecimal():
-            idx_end = i
-            break
-
-    if idx_start == -1 or idx_end == -1:
+    text = text.translate(_MONEY_TABLE)
+    match = _MONEY_RE.search(text)
+    if match is None:
         return default
 
-    if text.endswith("k"):
-        factor = 1_000
-    elif text.endswith("m") or text.endswith("mm"):
-        factor = 1_000_000
-    elif text.endswith("b"):
-        factor = 1_000_000_000
-    elif text.endswith("t"):
-        factor = 1_000_000_000_000
-    else:
-        factor = 1
-
+    # elided entirely under `python -O`, and skipped unless DEBUG logging is enabled
+    if __debug__ and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s -> %s", text, match.group(1))
     try:
-        print(f"{text} ->", text[idx_start:idx_end+1])
-        output = float(text[idx_start:idx_end+1])
+        output = float(match.group(1))
     except ValueError:
         return default
 
-    return round(output * factor, 2)
+    return round(output * _MONEY_FACTORS[match.group(2)], 2)
 
 
 # TODO Form types
@@ -96,7 +102,20 @@ class NotificationForm:
     Base class for Securities and Futures Act notification forms
     """
 
-    def __init__(self, stream: Union[StrByteType, Path]) -> None:
+    __slots__ = (
+        "__xml",
+        "_issuer_name",
+        "_issuer_type",
+        "_insider_name",
+        "_insider_title",
+        "_trade_date",
+        "_securities_before",
+        "_securities_after",
+        "_amt_consideration",
+        "_str_cache",
+    )
+
+    def __init__(self, stream: Union[StrByteType, Path, bytes]) -> None:
         self.__xml = extract_xml_from_xfa(stream)
         self._issuer_name = None
         self._issuer_type = None
@@ -106,8 +125,9 @@ class NotificationForm:
         self._securities_before = None
         self._securities_after = None
         self._amt_consideration = None
+        self._str_cache = None
 
-    def _xml(self) -> ET.Element:
+    def _xml(self) -> etree._Element:
         return self.__xml
 
     def issuer_name(self) -> str:
@@ -135,6 +155,12 @@ class NotificationForm:
         return self._amt_consideration
 
     def __str__(self) -> str:
+        # the parsed fields never change after parsing, so format them only once
+        if self._str_cache is None:
+            self._str_cache = self._format()
+        return self._str_cache
+
+    def _format(self) -> str:
         return f"""
 TRADE DATE: {self.trade_date()}
 ISSUER NAME: {self.issuer_name()}
@@ -161,17 +187,65 @@ class NotificationForm1(NotificationForm):
     Responsible person of listed REIT
     """
 
-    def __init__(self, stream: StrByteType | Path) -> None:
+    __slots__ = ("_is_notifying_at_appt_time", "_part_3_securities")
+
+    # Field paths, compiled once when the class is defined
+    _XP_NOTIFYING_AT_APPT_TIME = etree.XPath(".//Form1/Part1/notifyingAtApptTime")
+    _XP_ISSUER_NAME = etree.XPath(".//Form1/Part1/listedIssuer/name")
+    _XP_ISSUER_TYPE = etree.XPath(".//Form1/Part1/listedIssuer/type")
+    _XP_NAME_DIRECTOR = etree.XPath(".//Form1/Part1/nameDirector")
+    _XP_DATE_APPOINTMENT = etree.XPath(".//Form1/Part2/dateAppointmentDirectorLI")
+    _XP_DATE_ACQUISITION = etree.XPath(".//Form1/Part3/Transaction/dateAquisition")
+    _XP_AMT_CONSIDERATION = etree.XPath(".//Form1/Part3/Transaction/amtConsideration")
+    _XP_PART_2_NODE = etree.XPath(
+        ".//xfa:data/SFA289/Form1/Part2/T1", namespaces=XFA_NAMESPACES
+    )
+    _XP_PART_3_NODE = etree.XPath(
+        ".//xfa:data/SFA289/Form1/Part3/Transaction", namespaces=XFA_NAMESPACES
+    )
+
+    # (security type, xpath) evaluated against the Part II node. The paths are direct
+    # children of the node, so only the node itself needs a descendant search
+    _PART_2_TAGS = tuple(
+        (security_type, etree.XPath(f"./{path}"))
+        for security_type, path in (
+            (SecurityType.ORDINARY_SHARES, "ord/num/tot"),
+            (SecurityType.OTHER_SHARES, "othx/tot"),
+            (SecurityType.RIGHTS_OPTIONS_WARRANTS, "opt/num/tot"),
+            (SecurityType.DEBENTURES, "deb/amt/tot"),
+            (SecurityType.RIGHTS_OPTIONS_OF_DEBENTURES, "rDeb/amt/tot"),
+            (SecurityType.CONTRACTS, "con/amt/tot"),
+            (SecurityType.PARTICIPATORY_INTERESTS, "opt/part/tot"),
+            (SecurityType.OTHERS, "opt/oth/tot"),
+        )
+    )
+    # (security type, xpath before, xpath after) evaluated against the Part III transaction node
+    _PART_3_TAGS = tuple(
+        (
+            security_type,
+            etree.XPath(f"./{node}/before/{field}"),
+            etree.XPath(f"./{node}/after/{field}"),
+        )
+        for security_type, node, field in (
+            (SecurityType.ORDINARY_SHARES, "T1Ord", "num/tot"),
+            (SecurityType.OTHER_SHARES, "T2Othx", "tot"),
+            (SecurityType.RIGHTS_OPTIONS_WARRANTS, "T3Opt", "num/tot"),
+            (SecurityType.DEBENTURES, "T4Deb", "amt/tot"),
+            (SecurityType.RIGHTS_OPTIONS_OF_DEBENTURES, "T5RDeb", "amt/tot"),
+            (SecurityType.CONTRACTS, "T6Con", "amt/tot"),
+            (SecurityType.PARTICIPATORY_INTERESTS, "T7Part", "part/tot"),
+            (SecurityType.OTHERS, "T8Oth", "oth/tot"),
+        )
+    )
+
+    def __init__(self, stream: StrByteType | Path | bytes) -> None:
         super().__init__(stream)
         self._insider_title = "Director/CEO"
-        self._is_notifying_at_appt_time = xml_get_text(
-            self._xml(), "Form1/Part1/notifyingAtApptTime"
+        self._is_notifying_at_appt_time = xpath_get_text(
+            self._xml(), NotificationForm1._XP_NOTIFYING_AT_APPT_TIME
         ).strip()
-
-        (
-            self._securities_before,
-            self._securities_after,
-        ) = self.__parse_part_3_securities()
+        # parsed on first access to securities_before() / securities_after()
+        self._part_3_securities = None
 
     def is_notifying_at_appt_time(self) -> bool:
         """
@@ -182,29 +256,24 @@ class NotificationForm1(NotificationForm):
 
     def issuer_name(self) -> str:
         if self._issuer_name is None:
-            self._issuer_name = xml_get_text(
-                self._xml(), "Form1/Part1/listedIssuer/name"
+            self._issuer_name = xpath_get_text(
+                self._xml(), NotificationForm1._XP_ISSUER_NAME
             )
         return self._issuer_name
 
     def issuer_type(self) -> str:
         if self._issuer_type is None:
-            self._issuer_type = xml_get_text(
-                self._xml(), "Form1/Part1/listedIssuer/type"
+            self._issuer_type = xpath_get_text(
+                self._xml(), NotificationForm1._XP_ISSUER_TYPE
             )
 
-        if self._issuer_type == "1":
-            return "Company/Corporation"
-        elif self._issuer_type == "2":
-            return "Registered/Recognised Business Trust"
-        elif self._issuer_type == "3":
-            return "Real Estate Investment Trust"
-
-        return self._issuer_type
+        return _ISSUER_TYPES.get(self._issuer_type, self._issuer_type)
 
     def insider_name(self) -> str:
         if self._insider_name is None:
-            self._insider_name = xml_get_text(self._xml(), "Form1/Part1/nameDirector")
+            self._insider_name = xpath_get_text(
+                self._xml(), NotificationForm1._XP_NAME_DIRECTOR
+            )
         return self._insider_name
 
     def trade_date(self) -> str:
@@ -213,73 +282,56 @@ class NotificationForm1(NotificationForm):
 
         if self.is_notifying_at_appt_time():
             # Part II
-            self._trade_date = xml_get_text(
-                self._xml(), "Form1/Part2/dateAppointmentDirectorLI"
+            self._trade_date = xpath_get_text(
+                self._xml(), NotificationForm1._XP_DATE_APPOINTMENT
             )
         else:
             # Part III
-            self._trade_date = xml_get_text(
-                self._xml(), "Form1/Part3/Transaction/dateAquisition"
+            self._trade_date = xpath_get_text(
+                self._xml(), NotificationForm1._XP_DATE_ACQUISITION
             )
         return self._trade_date
 
     def __parse_part_2_securities(self) -> Dict[SecurityType, int] | None:
-        part_2_node = self._xml().find(".//xfa:data/SFA289/Form1/Part2/T1", _NAMESPACES)
-        if part_2_node is None:
+        nodes = NotificationForm1._XP_PART_2_NODE(self._xml())
+        if not nodes:
             return None
-
-        tags = [
-            (SecurityType.ORDINARY_SHARES, "ord/num/tot"),
-            (SecurityType.OTHER_SHARES, "othx/tot"),
-            (SecurityType.RIGHTS_OPTIONS_WARRANTS, "opt/num/tot"),
-            (SecurityType.DEBENTURES, "deb/amt/tot"),
-            (SecurityType.RIGHTS_OPTIONS_OF_DEBENTURES, "rDeb/amt/tot"),
-            (SecurityType.CONTRACTS, "con/amt/tot"),
-            (SecurityType.PARTICIPATORY_INTERESTS, "opt/part/tot"),
-            (SecurityType.OTHERS, "opt/oth/tot"),
-        ]
+        part_2_node = nodes[0]
 
         securities_by_type = {}
-        for tag in tags:
-            text = xml_get_text(part_2_node, tag[1])
+        for security_type, xpath in NotificationForm1._PART_2_TAGS:
+            text = xpath_get_text(part_2_node, xpath)
             if text:
-                securities_by_type[tag[0]] = int(text.replace(",", ""))
+                securities_by_type[security_type] = int(text.translate(_COMMA_STRIP))
         return securities_by_type
 
     def __parse_part_3_securities(
         self,
     ) -> Tuple[Dict[SecurityType, int], Dict[SecurityType, int]] | Tuple[None, None]:
-        part_3_node = self._xml().find(
-            ".//xfa:data/SFA289/Form1/Part3/Transaction", _NAMESPACES
-        )
-        if part_3_node is None:
+        nodes = NotificationForm1._XP_PART_3_NODE(self._xml())
+        if not nodes:
             return (None, None)
-
-        # Get type of securities present
-        tags = [
-            (SecurityType.ORDINARY_SHARES, "T1Ord", "num/tot"),
-            (SecurityType.OTHER_SHARES, "T2Othx", "tot"),
-            (SecurityType.RIGHTS_OPTIONS_WARRANTS, "T3Opt", "num/tot"),
-            (SecurityType.DEBENTURES, "T4Deb", "amt/tot"),
-            (SecurityType.RIGHTS_OPTIONS_OF_DEBENTURES, "T5RDeb", "amt/tot"),
-            (SecurityType.CONTRACTS, "T6Con", "amt/tot"),
-            (SecurityType.partition, "T7Part", "part/tot"),
-            (SecurityType.OTHERS, "T8Oth", "oth/tot"),
-        ]
+        part_3_node = nodes[0]
 
         securities_before = {}
         securities_after = {}
 
-        for tag in tags:
-            text = xml_get_text(part_3_node, f"{tag[1]}/before/{tag[2]}")
+        for security_type, xpath_before, xpath_after in NotificationForm1._PART_3_TAGS:
+            text = xpath_get_text(part_3_node, xpath_before)
             if text:
-                securities_before[tag[0]] = int(text.replace(",", ""))
+                securities_before[security_type] = int(text.translate(_COMMA_STRIP))
 
-            text = xml_get_text(part_3_node, f"{tag[1]}/after/{tag[2]}")
+            text = xpath_get_text(part_3_node, xpath_after)
             if text:
-                securities_after[tag[0]] = int(text.replace(",", ""))
+                securities_after[security_type] = int(text.translate(_COMMA_STRIP))
 
-        self._part_3_securities = (securities_before, securities_after)
+        return (securities_before, securities_after)
+
+    def __get_part_3_securities(
+        self,
+    ) -> Tuple[Dict[SecurityType, int], Dict[SecurityType, int]] | Tuple[None, None]:
+        if self._part_3_securities is None:
+            self._part_3_securities = self.__parse_part_3_securities()
         return self._part_3_securities
 
     def securities_before(self) -> Dict[SecurityType, int]:
@@ -289,8 +341,10 @@ class NotificationForm1(NotificationForm):
         if self.is_notifying_at_appt_time():
             # Get from Part II
             self._securities_before = self.__parse_part_2_securities()
+        else:
+            # Otherwise, get from Part III
+            self._securities_before = self.__get_part_3_securities()[0]
 
-        # Otherwise, get from Part III
         return self._securities_before
 
     def securities_after(self) -> Dict[SecurityType, int]:
@@ -304,6 +358,7 @@ class NotificationForm1(NotificationForm):
             return self.securities_before()
 
         # Otherwise, get from Part III
+        self._securities_after = self.__get_part_3_securities()[1]
         return self._securities_after
 
     def amt_consideration(self) -> int:
@@ -318,14 +373,14 @@ class NotificationForm1(NotificationForm):
                 return 0
 
             self._amt_consideration = money_str_to_float(
-                xml_get_text(self._xml(), "Form1/Part3/Transaction/amtConsideration"),
+                xpath_get_text(self._xml(), NotificationForm1._XP_AMT_CONSIDERATION),
                 default=0
             )
 
         return self._amt_consideration
 
-    def __str__(self) -> str:
-        return f"{super().__str__()}\nNOTIFYING AT TIME OF APPT: {self.is_notifying_at_appt_time()}"
+    def _format(self) -> str:
+        return f"{super()._format()}\nNOTIFYING AT TIME OF APPT: {self.is_notifying_at_appt_time()}"
 
 
 class NotificationForm2(NotificationForm):
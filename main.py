@@ -1,23 +1,27 @@
+from concurrent.futures import ProcessPoolExecutor
 from forms import NotificationForm1
 
+PDF_PATHS = [
+    "./pdfs/XFA_form1.pdf",
+    "./pdfs/sgx_form1_part2_xfa.pdf",
+    "./pdfs/SingTel_20130621_Form1.pdf",
+]
 
-def main():
-    with open("./pdfs/XFA_form1.pdf", "rb") as f:
-        print(f.name)
-        form1 = NotificationForm1(f)
-        print(form1)
 
-    print("======")
-    with open("./pdfs/sgx_form1_part2_xfa.pdf", "rb") as f:
-        print(f.name)
-        form2 = NotificationForm1(f)
-        print(form2)
+def parse_pdf(path: str) -> str:
+    with open(path, "rb") as f:
+        form = NotificationForm1(f.read())
+        return str(form)
+
 
-    print("======")
-    with open("./pdfs/SingTel_20130621_Form1.pdf", "rb") as f:
-        print(f.name)
-        form3 = NotificationForm1(f)
-        print(form3)
+def main():
+    # each pdf is independent, so parse them in separate processes
+    with ProcessPoolExecutor() as executor:
+        for i, (path, form) in enumerate(zip(PDF_PATHS, executor.map(parse_pdf, PDF_PATHS))):
+            if i > 0:
+                print("======")
+            print(path)
+            print(form)
 
 
 if __name__ == "__main__":
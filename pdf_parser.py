@@ -1,31 +1,64 @@
 # https://stackoverflow.com/questions/68261052/pypdf-unable-to-read-xfa-pdf-file-after-it-has-been-filled-in-using-itextsharp
+import hashlib
+import io
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Union
-import xml.etree.ElementTree as ET
+from lxml import etree
 from pypdf import PdfReader
 from pypdf._reader import StrByteType
 
 
+XFA_NAMESPACES = {"xfa": "http://www.xfa.org/schema/xfa-data/1.0/"}
+
+# Reused for every document. Only element text is ever read, so whitespace-only text,
+# comments and processing instructions are dropped while parsing to keep the tree small
+_XML_PARSER = etree.XMLParser(
+    remove_blank_text=True, remove_comments=True, remove_pis=True
+)
+
+# xml roots of recently parsed pdfs, keyed by a digest of the pdf's bytes
+_XML_CACHE: "OrderedDict[bytes, etree._Element | None]" = OrderedDict()
+_XML_CACHE_SIZE = 128
+_XML_CACHE_LOCK = threading.Lock()
+
+
 class PdfParserException(Exception):
     pass
 
 
+def _read_pdf_bytes(stream: Union[StrByteType, Path, bytes]) -> bytes:
+    if isinstance(stream, bytes):
+        return stream
+    if isinstance(stream, (str, Path)):
+        return Path(stream).read_bytes()
+    stream.seek(0)
+    return stream.read()
+
+
 def extract_xml_from_xfa(
-    stream: Union[StrByteType, Path],
+    stream: Union[StrByteType, Path, bytes],
     debug_filename=None,
-) -> ET.Element | None:
+) -> etree._Element | None:
     """
     Params
     ------
-    stream: `StrByteType | Path`
+    stream: `StrByteType | Path | bytes`
     - A File object or an object that supports the standard read and seek methods similar
-      to a File object. Could also be a string representing a path to a PDF file.
+      to a File object. Could also be a string representing a path to a PDF file, or the
+      contents of a PDF file.
 
     Returns
     ------
-    - The `xml.etree.ElementTree.Element` root of the xml document
+    - The `lxml.etree._Element` root of the xml document
     - `None` if no xml found
 
+    Note
+    ------
+    Results are cached by the PDF's contents, so the same root may be returned for
+    identical PDFs and must not be modified
+
     Exceptions
     ------
     Raises `PdfParserException`
@@ -33,45 +66,63 @@ def extract_xml_from_xfa(
     - if the XML was unable to be decoded to UTF-8 or parsed
     """
 
-    reader = PdfReader(stream)
-    if reader.xfa is None:
+    data = _read_pdf_bytes(stream)
+    if debug_filename:
+        return _parse_xml_from_xfa(data, debug_filename)
+
+    key = hashlib.blake2b(data, digest_size=16).digest()
+    with _XML_CACHE_LOCK:
+        if key in _XML_CACHE:
+            _XML_CACHE.move_to_end(key)
+            return _XML_CACHE[key]
+
+    # parse outside the lock so other threads are not blocked on pypdf
+    xml_tree_root = _parse_xml_from_xfa(data)
+    with _XML_CACHE_LOCK:
+        _XML_CACHE[key] = xml_tree_root
+        if len(_XML_CACHE) > _XML_CACHE_SIZE:
+            _XML_CACHE.popitem(last=False)
+    return xml_tree_root
+
+
+def _parse_xml_from_xfa(data: bytes, debug_filename=None) -> etree._Element | None:
+    # pypdf rebuilds (and decompresses) the xfa dict on every access, so only read it once
+    xfa = PdfReader(io.BytesIO(data)).xfa
+    if xfa is None:
         raise PdfParserException("No XFA in PDF")
 
-    xml = reader.xfa.get("datasets")
+    xml = xfa.get("datasets")
     if xml is None:
         return None
 
     try:
-        xml_string = xml.decode("utf-8")
-
         if debug_filename:
             with open(debug_filename, "w", encoding="UTF-8") as f:
-                f.write(xml_string)
+                f.write(xml.decode("utf-8"))
 
-        xml_tree_root = ET.fromstring(xml_string)
+        # lxml parses bytes directly and honours the encoding in the xml declaration
+        xml_tree_root = etree.fromstring(xml, _XML_PARSER)
         return xml_tree_root
     except Exception as err:
         raise PdfParserException("Unable to parse xml") from err
 
 
-def xml_get_text(root: ET.Element, field: str) -> str:
+def xpath_get_text(root: etree._Element, xpath: etree.XPath) -> str:
     """
     Params
     ------
-    root: `ET.Element`
-    - The xml root
+    root: `etree._Element`
+    - The xml node `xpath` is evaluated against
 
-    field: `str`
-    - The field to extract text from
+    xpath: `etree.XPath`
+    - A precompiled xpath selecting the element, e.g.
+      `etree.XPath(".//Form1/Part1/nameDirector")`
 
     Returns
     ------
-    the element's text, or empty str `""` if element not found or element has no text
+    the first matching element's text, or empty str `""` if element not found or element has no text
     """
-    element = root.find(f".//{field}")
-    if element is None:
-        return ""
-
-    if element.text is None:
+    matches = xpath(root)
+    if not matches or matches[0].text is None:
         return ""
-    return element.text
+    return matches[0].text